@@ -0,0 +1,140 @@
+# checkpoint.py - Periodic Checkpoints of a Running Value Iteration
+
+# A checkpoint is a results_io container with V as an array and the
+# iteration count, last max_change and config in the JSON header; it is
+# rewritten whole each time, so its size stays at one grid. History
+# entries go to an append-only side file (path + HISTORY_SUFFIX, raw
+# float64 grids) and are written once each; the checkpoint header records
+# how many of them belong to it.
+# Snapshots are taken on the solver thread (a copy of V plus any history
+# entries added since the last one); a background thread does the writing.
+
+import os
+import threading
+import numpy as np
+from results_io import config_from_header, config_to_header, read_container, write_container
+
+HISTORY_SUFFIX = '.history'
+
+def history_path(path):
+    """Path of the append-only history file that belongs to a checkpoint"""
+    return f"{path}{HISTORY_SUFFIX}"
+
+def load_checkpoint(path):
+    """Load a checkpoint as a dict of iteration, max_change, config, V and history arrays"""
+    header, arrays = read_container(path, mmap=False)
+    if header.get('kind') != 'checkpoint':
+        raise ValueError(f"{path} is not a value iteration checkpoint")
+    config = config_from_header(header['config'], arrays['obstacles'])
+
+    # The side file may hold entries written after this checkpoint; ignore them
+    history = None
+    length = header['history_length']
+    if length:
+        count = length * config.rows * config.cols
+        history = np.fromfile(history_path(path), dtype=np.float64, count=count)
+        if history.size != count:
+            raise ValueError(f"{history_path(path)} is shorter than its checkpoint")
+        history = history.reshape(length, config.rows, config.cols)
+
+    return {
+        'iteration': header['iteration'],
+        'max_change': header['max_change'],
+        'solver': header['solver'],
+        'config': config,
+        'V': arrays['V'],
+        'history': history,
+    }
+
+class CheckpointWriter:
+    """Write solver snapshots to one file from a background thread
+
+    Only the most recent pending snapshot is kept: if the disk is slower than
+    the sweeps, intermediate checkpoints are skipped rather than queued.
+    History entries are never skipped; each is appended to the side file once.
+    """
+
+    def __init__(self, path, include_history=True, history_length=0):
+        # history_length: entries of vi.history already in the side file (when resuming)
+        self.path = path
+        self.include_history = include_history
+        self._saved = history_length  # History entries handed to the writer thread
+        self._written = history_length  # History entries in the side file
+        self._trim = True  # Drop stale entries from the side file before the first append
+        self._obstacles = None
+        self._pending = None
+        self._pending_history = []
+        self._closed = False
+        self._error = None
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._work, daemon=True)
+        self._thread.start()
+
+    def save(self, vi):
+        """Snapshot vi's state and hand it to the writer thread"""
+        if self._error is not None:
+            raise self._error
+
+        history = []
+        if self.include_history:
+            history = [vi.get_value_array(i) for i in range(self._saved, vi.get_history_length())]
+            self._saved += len(history)
+
+        config_data, obstacles = config_to_header(vi.config)
+        if self._obstacles is None:
+            self._obstacles = obstacles
+        header = {
+            'kind': 'checkpoint',
+            'solver': type(vi).__name__,
+            'iteration': vi.iteration,
+            'max_change': vi.max_change,
+            'history_length': self._saved if self.include_history else 0,
+            'config': config_data,
+        }
+        arrays = {'V': vi.get_value_array(), 'obstacles': self._obstacles}
+
+        with self._condition:
+            self._pending = (header, arrays)
+            self._pending_history.extend(history)
+            self._condition.notify()
+
+    def close(self):
+        """Flush the last snapshot and stop the writer thread"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def _append_history(self, history):
+        with open(history_path(self.path), 'ab') as f:
+            if self._trim:
+                size = self._written * history[0].nbytes
+                if f.seek(0, os.SEEK_END) > size:
+                    f.truncate(size)
+                self._trim = False
+            for values in history:
+                f.write(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+        self._written += len(history)
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._pending is None:
+                    return
+                header, arrays = self._pending
+                history = self._pending_history
+                self._pending = None
+                self._pending_history = []
+
+            try:
+                # History first, so the checkpoint never counts entries not yet on disk
+                if history:
+                    self._append_history(history)
+                write_container(self.path, header, arrays)
+            except Exception as e:
+                self._error = e
+                return
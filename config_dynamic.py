@@ -1,37 +1,99 @@
 # config_dynamic.py - Dynamic Configuration from User Input
 
-# This file will be populated by user input
-# Default values (will be overwritten)
-
-GRID_ROWS = 4
-GRID_COLS = 4
-
-GOAL_STATE = (0, 3)
-FIRE_STATE = (1, 3)
-OBSTACLES = [(1, 1)]
-START_STATE = (3, 0)
-
-GOAL_REWARD = 1.0
-FIRE_REWARD = -1.0
-STEP_REWARD = 0.0
-
-GAMMA = 0.9
-THETA = 0.001
-MAX_ITERATIONS = 100
-
-ACTIONS = ['UP', 'DOWN', 'LEFT', 'RIGHT']
-
-def set_configuration(config):
-    """Set configuration from user input dictionary"""
-    global GRID_ROWS, GRID_COLS, GOAL_STATE, FIRE_STATE, OBSTACLES, START_STATE
-    global GAMMA, THETA, MAX_ITERATIONS
-    
-    GRID_ROWS = config['rows']
-    GRID_COLS = config['cols']
-    GOAL_STATE = config['goal']
-    FIRE_STATE = config['fire']
-    OBSTACLES = config['obstacles']
-    START_STATE = config['start']
-    GAMMA = config['gamma']
-    THETA = config['theta']
-    MAX_ITERATIONS = config['max_iterations']
+# Configuration is an immutable object passed explicitly into GridWorld;
+# solvers, the simulator and the visualizer all read it from env.config, so
+# several solves can run side by side (threads, async tasks) without sharing
+# any module state or mixing parameters.
+
+from dataclasses import asdict, dataclass, fields, replace
+
+# (d_row, d_col) for every action name a configuration may use
+ACTION_OFFSETS = {
+    'UP': (-1, 0),
+    'DOWN': (1, 0),
+    'LEFT': (0, -1),
+    'RIGHT': (0, 1),
+    'UP_LEFT': (-1, -1),
+    'UP_RIGHT': (-1, 1),
+    'DOWN_LEFT': (1, -1),
+    'DOWN_RIGHT': (1, 1),
+    'STAY': (0, 0),
+}
+
+# Predefined action sets
+ACTIONS = ('UP', 'DOWN', 'LEFT', 'RIGHT')
+ACTIONS_8 = ACTIONS + ('UP_LEFT', 'UP_RIGHT', 'DOWN_LEFT', 'DOWN_RIGHT')
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Immutable Grid World / solver configuration"""
+    rows: int = 4
+    cols: int = 4
+
+    goal: tuple = (0, 3)
+    fire: tuple = (1, 3)
+    obstacles: tuple = ((1, 1),)
+    start: tuple = (3, 0)
+
+    goal_reward: float = 1.0
+    fire_reward: float = -1.0
+    step_reward: float = 0.0
+
+    gamma: float = 0.9
+    theta: float = 0.001
+    max_iterations: int = 100
+
+    actions: tuple = ACTIONS
+    diagonal_cost: float = 1.0  # Step reward multiplier for diagonal moves
+
+    def __post_init__(self):
+        # Normalise containers so the object stays hashable and immutable
+        object.__setattr__(self, 'obstacles', tuple(tuple(o) for o in (self.obstacles or ())))
+        object.__setattr__(self, 'actions', tuple(self.actions))
+        unknown = [a for a in self.actions if a not in ACTION_OFFSETS]
+        if unknown:
+            raise ValueError(f"Unknown actions: {unknown}")
+
+    def get_step_reward(self, action):
+        """Reward for a move that does not enter a terminal state"""
+        d_row, d_col = ACTION_OFFSETS[action]
+        if d_row and d_col:
+            return self.step_reward * self.diagonal_cost
+        return self.step_reward
+
+    def with_changes(self, **changes):
+        """Return a copy of this configuration with some fields replaced"""
+        return replace(self, **changes)
+
+    def to_dict(self):
+        """Plain dictionary of all fields (JSON-serialisable)"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a Config from to_dict() output, restoring tuple states"""
+        names = {f.name for f in fields(cls)}
+        data = {k: v for k, v in data.items() if k in names}
+        for key in ('goal', 'fire', 'start'):
+            if data.get(key) is not None:
+                data[key] = tuple(data[key])
+        return cls(**data)
+
+DEFAULT_CONFIG = Config()
+
+def make_configuration(config):
+    """Build a Config from the user input dictionary"""
+    return Config(
+        rows=config['rows'],
+        cols=config['cols'],
+        goal=config['goal'],
+        fire=config['fire'],
+        obstacles=config['obstacles'],
+        start=config['start'],
+        gamma=config['gamma'],
+        theta=config['theta'],
+        max_iterations=config['max_iterations'],
+        step_reward=config.get('step_reward', 0.0),
+        actions=config.get('actions', ACTIONS),
+        diagonal_cost=config.get('diagonal_cost', 1.0),
+    )
@@ -1,24 +1,50 @@
 # environment.py - Grid World Environment
 
-import config_dynamic as config
+import numpy as np
+from config_dynamic import ACTION_OFFSETS, DEFAULT_CONFIG
 
 class GridWorld:
-    """Simple Grid World Environment"""
+    """Simple Grid World Environment
     
-    def __init__(self):
-        self.rows = config.GRID_ROWS
-        self.cols = config.GRID_COLS
-        self.goal = config.GOAL_STATE
-        self.fire = config.FIRE_STATE
-        self.obstacles = config.OBSTACLES if config.OBSTACLES else []
+    Validity, the action set and every state's moves are computed once per
+    environment, so solvers never rebuild them per sweep.
+    """
+    
+    def __init__(self, config=None):
+        self.config = config if config is not None else DEFAULT_CONFIG
+        self.rows = self.config.rows
+        self.cols = self.config.cols
+        self.goal = self.config.goal
+        self.fire = self.config.fire
+        self.obstacles = self.config.obstacles
+        self._obstacle_set = frozenset(self.obstacles)
+        
+        # Action set as integer offset and per-action step reward arrays
+        self.actions = self.config.actions
+        self.action_offsets = np.array([ACTION_OFFSETS[a] for a in self.actions],
+                                       dtype=np.int64).reshape(-1, 2)
+        self.action_rewards = np.array([self.config.get_step_reward(a) for a in self.actions],
+                                       dtype=np.float64)
+        self._action_list = list(zip(self.actions, self.action_offsets.tolist(),
+                                     self.action_rewards.tolist()))
+        
+        self._valid = np.ones((self.rows, self.cols), dtype=bool)
+        for row, col in self.obstacles:
+            self._valid[row, col] = False
         
+        # Built on first use, so solvers that only touch part of the grid
+        # never pay for the whole of it
+        self._states = None
+        self._moves = {}  # state -> [(action, next_state, step reward)]
+        self._action_targets = None
+    
     def is_valid_state(self, row, col):
         """Check if state is within bounds and not an obstacle"""
         if row < 0 or row >= self.rows:
             return False
         if col < 0 or col >= self.cols:
             return False
-        if (row, col) in self.obstacles:
+        if (row, col) in self._obstacle_set:
             return False
         return True
     
@@ -30,55 +56,85 @@ class GridWorld:
             return True
         return False
     
+    def get_moves(self, state):
+        """Get (action, next_state, step reward) for each valid action, computed once per state"""
+        moves = self._moves.get(state)
+        if moves is None:
+            moves = []
+            if not self.is_terminal(state) and self.is_valid_state(*state):
+                row, col = state
+                for action, (d_row, d_col), reward in self._action_list:
+                    if self.is_valid_state(row + d_row, col + d_col):
+                        moves.append((action, (row + d_row, col + d_col), reward))
+            self._moves[state] = moves
+        return moves
+    
     def get_possible_actions(self, state):
         """Get valid actions from current state"""
-        if self.is_terminal(state):
-            return []
-        
-        row, col = state
-        actions = []
-        
-        # Check each direction
-        if self.is_valid_state(row - 1, col):  # UP
-            actions.append('UP')
-        if self.is_valid_state(row + 1, col):  # DOWN
-            actions.append('DOWN')
-        if self.is_valid_state(row, col - 1):  # LEFT
-            actions.append('LEFT')
-        if self.is_valid_state(row, col + 1):  # RIGHT
-            actions.append('RIGHT')
-        
-        return actions
+        return [action for action, _, _ in self.get_moves(state)]
     
     def get_next_state(self, state, action):
         """Get next state after taking action"""
         row, col = state
-        
-        if action == 'UP':
-            return (row - 1, col)
-        elif action == 'DOWN':
-            return (row + 1, col)
-        elif action == 'LEFT':
-            return (row, col - 1)
-        elif action == 'RIGHT':
-            return (row, col + 1)
-        
-        return state  # Should not reach here
+        d_row, d_col = ACTION_OFFSETS.get(action, (0, 0))
+        return (row + d_row, col + d_col)
     
     def get_reward(self, state):
         """Get reward for being in a state"""
         if state == self.goal:
-            return config.GOAL_REWARD
+            return self.config.goal_reward
         elif self.fire and state == self.fire:
-            return config.FIRE_REWARD
+            return self.config.fire_reward
         else:
-            return config.STEP_REWARD
+            return self.config.step_reward
     
     def get_all_states(self):
         """Get all valid states in the grid"""
-        states = []
-        for row in range(self.rows):
-            for col in range(self.cols):
-                if self.is_valid_state(row, col):
-                    states.append((row, col))
-        return states
+        if self._states is None:
+            self._states = [tuple(map(int, s)) for s in np.argwhere(self._valid)]
+        return self._states
+    
+    def get_valid_mask(self):
+        """Get a (rows, cols) boolean array that is True for valid states"""
+        return self._valid.copy()
+    
+    def get_action_offsets(self):
+        """Get (d_row, d_col) for each action in config.actions"""
+        return [(int(d_row), int(d_col)) for d_row, d_col in self.action_offsets]
+    
+    def get_terminal_mask(self):
+        """Get a (rows, cols) boolean array that is True for goal and fire"""
+        terminal = np.zeros((self.rows, self.cols), dtype=bool)
+        terminal[self.goal] = True
+        if self.fire:
+            terminal[self.fire] = True
+        return terminal
+    
+    def get_action_targets(self):
+        """Per action: (allowed mask, target rows, target cols) over the whole grid
+        
+        A move is allowed when both the cell and its target are valid states.
+        Built once per environment; callers must not modify the arrays.
+        """
+        if self._action_targets is not None:
+            return self._action_targets
+        
+        valid = self._valid
+        row_idx, col_idx = np.indices((self.rows, self.cols))
+        
+        targets = []
+        for d_row, d_col in self.action_offsets:
+            n_row, n_col = row_idx + d_row, col_idx + d_col
+            inside = (n_row >= 0) & (n_row < self.rows) & (n_col >= 0) & (n_col < self.cols)
+            n_row, n_col = np.clip(n_row, 0, self.rows - 1), np.clip(n_col, 0, self.cols - 1)
+            targets.append((valid & inside & valid[n_row, n_col], n_row, n_col))
+        
+        self._action_targets = targets
+        return targets
+    
+    def get_movable_mask(self):
+        """Get a (rows, cols) boolean array that is True for states value iteration updates"""
+        movable = np.zeros((self.rows, self.cols), dtype=bool)
+        for allowed, _, _ in self.get_action_targets():
+            movable |= allowed
+        return movable & ~self.get_terminal_mask()
@@ -0,0 +1,191 @@
+# goal_directed.py - Goal-Directed Solving from a Start State
+
+from value_iteration import ValueIteration
+
+class GoalDirectedSolver(ValueIteration):
+    """Solve only the states relevant to reaching the goal from one start state
+
+    LAO*-style: values start at an optimistic heuristic built from the
+    Manhattan (or, with diagonal moves, Chebyshev) distance to the goal.
+    Each round follows the greedy policy from the start and adds the states
+    it visits to the envelope, backing them up from the end of the route;
+    states outside the envelope keep their heuristic value. When a route
+    adds nothing new and its values no longer change, the envelope is solved
+    to θ, and solving stops once that solve finds nothing left to change. The work
+    scales with the region around that route rather than with the grid.
+    """
+
+    def __init__(self, env, start=None):
+        # The full-grid initialisation of ValueIteration is exactly what this avoids
+        self.env = env
+        self.config = env.config
+        self.start = start if start is not None else self.config.start
+        self.V = {}  # Value function, envelope states only
+        self.policy = {}  # Optimal policy, envelope states only
+        self.history = [{}]  # Envelope values after each full envelope solve
+        self.rounds = 0
+        self.backups = 0
+
+        self.step_bound = max(self.env.action_rewards.tolist())
+        offsets = self.env.get_action_offsets()
+        self.diagonal = any(d_row and d_col for d_row, d_col in offsets)
+
+    def distance_bound(self, state):
+        """Lower bound on the number of moves from state to the goal"""
+        d_row = abs(state[0] - self.env.goal[0])
+        d_col = abs(state[1] - self.env.goal[1])
+        return max(d_row, d_col) if self.diagonal else d_row + d_col
+
+    def heuristic(self, state):
+        """Upper bound on V*(state)
+
+        Reaching the goal takes at least distance_bound moves, each earning at
+        most the largest step reward; the other options are walking into the
+        fire or never terminating, which are bounded the same way.
+        """
+        gamma = self.config.gamma
+        d = self.distance_bound(state)
+        goal_reward = self.env.get_reward(self.env.goal)
+
+        if gamma < 1:
+            wander = self.step_bound / (1 - gamma)
+            discount = gamma ** (d - 1)
+            reach_goal = wander * (1 - discount) + discount * goal_reward
+        else:
+            wander = 0.0 if self.step_bound == 0 else float('-inf')
+            reach_goal = self.step_bound * (d - 1) + goal_reward
+
+        bound = max(reach_goal, wander)
+        if self.env.fire:
+            bound = max(bound, self.env.get_reward(self.env.fire))
+        return bound
+
+    def is_applicable(self):
+        """Check that there is a usable start state and a finite heuristic"""
+        if self.start is None:
+            return False
+        if not self.env.is_valid_state(*self.start) or self.env.is_terminal(self.start):
+            return False
+        # With γ = 1, positive step rewards make values unbounded
+        return self.config.gamma < 1 or self.step_bound <= 0
+
+    def value(self, state):
+        """Current estimate: envelope value or heuristic"""
+        value = self.V.get(state)
+        return self.heuristic(state) if value is None else value
+
+    def calculate_move_value(self, next_state, step_reward):
+        """Q-value of a move landing on next_state, using the heuristic outside the envelope"""
+        if next_state == self.env.goal:
+            return self.env.get_reward(next_state)
+        if self.env.fire and next_state == self.env.fire:
+            return self.env.get_reward(next_state)
+        return step_reward + self.config.gamma * self.value(next_state)
+
+    def best_move(self, state):
+        """Greedy (value, action, next_state) for a state; ties go to the first action"""
+        best = None
+        for action, next_state, step_reward in self.env.get_moves(state):
+            q = self.calculate_move_value(next_state, step_reward)
+            if best is None or q > best[0]:
+                best = (q, action, next_state)
+        return best
+
+    def backup(self, state):
+        """Bellman backup of an envelope state; states without a move stay at 0, as in value iteration"""
+        best = self.best_move(state)
+        return 0.0 if best is None else best[0]
+
+    def greedy_route(self):
+        """States visited by the greedy policy from the start (stops at a terminal or a loop)"""
+        route = []
+        seen = set()
+        state = self.start
+        while not self.env.is_terminal(state) and state not in seen:
+            seen.add(state)
+            route.append(state)
+            best = self.best_move(state)
+            if best is None:
+                break
+            state = best[2]
+        return route
+
+    def solve_envelope(self, max_sweeps):
+        """In-place Bellman sweeps over the envelope until max_change < θ"""
+        sweeps = 0
+        max_change = 0.0
+        while sweeps < max_sweeps:
+            sweeps += 1
+            max_change = 0.0
+            for state in self.V:
+                value = self.backup(state)
+                max_change = max(max_change, abs(value - self.V[state]))
+                self.V[state] = value
+            self.backups += len(self.V)
+            if max_change < self.config.theta:
+                break
+        return sweeps, max_change
+
+    def run(self, max_iterations=None):
+        """Grow and solve the envelope until the greedy route from the start settles"""
+        if max_iterations is None:
+            max_iterations = self.config.max_iterations
+
+        if not self.is_applicable():
+            print("\n⚠️  Goal-directed solving needs a valid start state, using value iteration")
+            ValueIteration.__init__(self, self.env)
+            return ValueIteration.run(self, max_iterations)
+
+        print(f"\n--- Goal-Directed Value Iteration Started (start = {self.start}) ---\n")
+
+        converged = False
+        total = int(self.env.get_valid_mask().sum())
+        max_rounds = max_iterations * total
+        while self.rounds < max_rounds:
+            self.rounds += 1
+
+            route = self.greedy_route()
+            new_states = [s for s in route if s not in self.V]
+            for state in new_states:
+                self.V[state] = self.heuristic(state)
+
+            # Cheap RTDP-style pass: back up the route from its end
+            route_change = 0.0
+            for state in reversed(route):
+                value = self.backup(state)
+                route_change = max(route_change, abs(value - self.V[state]))
+                self.V[state] = value
+            self.backups += len(route)
+            if new_states or route_change >= self.config.theta:
+                continue
+
+            # Route looks settled: solve the whole envelope to confirm
+            sweeps, max_change = self.solve_envelope(max_iterations)
+            self.history.append(self.V.copy())
+
+            print(f"Round {self.rounds}: envelope {len(self.V)}, "
+                  f"{sweeps} sweeps, max_change = {max_change:.6f}")
+
+            if sweeps == 1:
+                converged = True
+                break
+
+        if converged:
+            print(f"\n✅ Converged after {self.rounds} rounds!")
+            print(f"   (Convergence threshold θ = {self.config.theta})")
+        else:
+            print(f"\n⚠️  Envelope did not settle within {self.rounds} rounds "
+                  f"({max_iterations} sweeps per round)")
+
+        self.extract_policy()
+
+        print(f"\n📊 Solved {len(self.V)} of {total} states ({self.backups} backups)")
+        print(f"   V{self.start} = {self.V[self.start]:.6f}")
+
+        return self.rounds
+
+    def extract_policy(self):
+        """Greedy policy for the envelope states"""
+        for state in self.V:
+            best = self.best_move(state)
+            self.policy[state] = best[1] if best else None
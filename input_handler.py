@@ -1,5 +1,7 @@
 # input_handler.py - Interactive User Input Handler
 
+from config_dynamic import ACTIONS, ACTIONS_8
+
 def get_grid_dimensions():
     """Get grid dimensions from user"""
     print("\n" + "="*50)
@@ -150,6 +152,70 @@ def get_start_state(rows, cols, goal, fire, obstacles):
         print(f"✅ Start: {state}")
         return state
 
+def get_action_set():
+    """Get movement type (4/8-connected, optional stay) from user"""
+    print(f"\n🧭 Movement [Optional]")
+    
+    while True:
+        connectivity = input("Movement directions (4 or 8) [4]: ").strip()
+        if connectivity in ['', '4', '8']:
+            break
+        print("❌ Please enter 4 or 8")
+    
+    actions = ACTIONS_8 if connectivity == '8' else ACTIONS
+    step_reward = 0.0
+    diagonal_cost = 1.0
+    
+    if connectivity == '8':
+        # The diagonal cost scales the step reward, so it needs a non-zero one
+        while True:
+            try:
+                step_input = input("Step reward per straight move (0 or negative) [0.0]: ").strip()
+                step_reward = float(step_input) if step_input else 0.0
+                if step_reward > 0:
+                    print("❌ Step reward must be 0 or negative")
+                    continue
+                break
+            except ValueError:
+                print("❌ Invalid input. Please enter a number.")
+        
+        if step_reward == 0:
+            print("ℹ️  No step reward: diagonal and straight moves cost the same")
+        else:
+            while True:
+                try:
+                    cost_input = input("Diagonal step cost multiplier [1.0]: ").strip()
+                    diagonal_cost = float(cost_input) if cost_input else 1.0
+                    if diagonal_cost <= 0:
+                        print("❌ Cost multiplier must be positive")
+                        continue
+                    break
+                except ValueError:
+                    print("❌ Invalid input. Please enter a positive number.")
+    
+    response = input("Allow staying in place? (yes/no) [no]: ").strip().lower()
+    if response in ['yes', 'y']:
+        actions = actions + ('STAY',)
+    
+    print(f"✅ Actions: {', '.join(actions)}")
+    return actions, step_reward, diagonal_cost
+
+def get_solver_mode():
+    """Get solver mode from user"""
+    print(f"\n⚙️  Solver [Optional]")
+    print("1. Value iteration (every iteration can be animated)")
+    print("2. Shortest-path wavefront (one pass, for large grids; falls back to 1 when not applicable)")
+    
+    while True:
+        choice = input("Select solver (1-2) [1]: ").strip()
+        if choice in ['', '1']:
+            print("✅ Solver: value iteration")
+            return 'value_iteration'
+        if choice == '2':
+            print("✅ Solver: shortest-path wavefront")
+            return 'shortest_path'
+        print("❌ Please enter 1 or 2")
+
 def get_algorithm_parameters():
     """Get algorithm parameters from user"""
     print("\n" + "="*50)
@@ -228,9 +294,11 @@ def get_user_configuration():
     fire = get_fire_state(rows, cols, goal)
     obstacles = get_obstacles(rows, cols, goal, fire)
     start = get_start_state(rows, cols, goal, fire, obstacles)
+    actions, step_reward, diagonal_cost = get_action_set()
     
     # Get algorithm parameters
     gamma, theta, max_iterations = get_algorithm_parameters()
+    solver = get_solver_mode()
     
     # Summary
     print("\n" + "="*70)
@@ -241,9 +309,12 @@ def get_user_configuration():
     print(f"Fire State:       {fire if fire else 'None'} {('(reward: -1)' if fire else '')}")
     print(f"Obstacles:        {obstacles if obstacles else 'None'}")
     print(f"Start State:      {start if start else 'Not specified'}")
+    print(f"Actions:          {len(actions)} ({', '.join(actions)})")
+    print(f"Step Reward:      {step_reward} (diagonal x{diagonal_cost})")
     print(f"Discount (γ):     {gamma}")
     print(f"Threshold (θ):    {theta}")
     print(f"Max Iterations:   {max_iterations}")
+    print(f"Solver:           {solver.replace('_', ' ')}")
     print("="*70)
     
     response = input("\nProceed with this configuration? (yes/no) [yes]: ").strip().lower()
@@ -258,7 +329,11 @@ def get_user_configuration():
         'fire': fire,
         'obstacles': obstacles,
         'start': start,
+        'actions': actions,
+        'step_reward': step_reward,
+        'diagonal_cost': diagonal_cost,
         'gamma': gamma,
         'theta': theta,
-        'max_iterations': max_iterations
+        'max_iterations': max_iterations,
+        'solver': solver
     }
@@ -1,10 +1,13 @@
 # main.py - Main Execution Script with Interactive Input
 
-import config_dynamic
+from config_dynamic import make_configuration
 from input_handler import get_user_configuration
 from environment import GridWorld
 from value_iteration import ValueIteration
+from shortest_path import ShortestPathSolver
 from visualizer import Visualizer
+from simulator import Simulator
+from results_io import save_results
 import matplotlib.pyplot as plt
 import sys
 
@@ -15,21 +18,24 @@ def main():
     if user_config is None:
         sys.exit(0)
     
-    # Set the configuration
-    config_dynamic.set_configuration(user_config)
+    # Build the (immutable) configuration
+    config = make_configuration(user_config)
     
     print("\n" + "="*70)
     print("   RUNNING VALUE ITERATION")
     print("="*70)
     
     # Create environment
-    env = GridWorld()
+    env = GridWorld(config)
     print(f"\n✅ Environment created: {env.rows}x{env.cols} Grid")
     print(f"   Goal: {env.goal} | Fire: {env.fire} | Obstacles: {len(env.obstacles)}")
     
-    # Run Value Iteration
-    vi = ValueIteration(env)
-    num_iterations = vi.run(max_iterations=user_config['max_iterations'])
+    # Run Value Iteration (or one wavefront pass, if chosen and the grid allows it)
+    if user_config.get('solver') == 'shortest_path':
+        vi = ShortestPathSolver(env)
+    else:
+        vi = ValueIteration(env)
+    num_iterations = vi.run()
     
     # Create visualizer
     viz = Visualizer(vi)
@@ -41,6 +47,20 @@ def main():
     viz.print_text_grid()
     viz.print_policy()
     
+    # Validate the policy with rollouts
+    sim = Simulator(vi)
+    if config.start:
+        start_results = sim.rollout(config.start, record_paths=True)
+        length = start_results['length'][0]
+        path = [divmod(int(c), env.cols) for c in start_results['paths'][0, :length + 1]]
+        print(f"\n🎯 Path from start {config.start}: {' → '.join(map(str, path))}")
+        print(f"   Steps: {length} | Return: {start_results['return'][0]:.4f}")
+    starts = sim.sample_start_states(10000, seed=0)
+    if len(starts):
+        sim.print_summary(sim.rollout(starts))
+    else:
+        print("\nPolicy Rollouts: no non-terminal states to start from")
+    
     # Ask user what visualizations they want
     print("\n" + "="*70)
     print("   VISUALIZATION OPTIONS")
@@ -72,7 +92,7 @@ def main():
         
         if choice in ['2', '4']:
             print("   - Creating value function plot...")
-            fig1 = viz.plot_iteration(num_iterations - 1)
+            fig1 = viz.plot_iteration(len(vi.history) - 1)
             plt.show()
         
         if choice in ['3', '4']:
@@ -80,6 +100,11 @@ def main():
             fig2 = viz.plot_policy()
             plt.show()
     
+    # Optionally export results for other tools
+    save_path = input("\nSave results to file (path) [Enter to skip]: ").strip()
+    if save_path:
+        save_results(save_path, vi, stats={'iterations': num_iterations}, include_history=True)
+    
     print("\n" + "="*70)
     print("   ✅ VALUE ITERATION COMPLETE!")
     print("="*70)
@@ -87,8 +112,8 @@ def main():
     print(f"   Total iterations: {num_iterations}")
     print(f"   Grid size: {env.rows}x{env.cols}")
     print(f"   States processed: {len(env.get_all_states())}")
-    print(f"   Discount factor (γ): {user_config['gamma']}")
-    print(f"   Convergence threshold (θ): {user_config['theta']}")
+    print(f"   Discount factor (γ): {config.gamma}")
+    print(f"   Convergence threshold (θ): {config.theta}")
     print("\n   Thank you for using Value Iteration! 🎉\n")
 
 if __name__ == "__main__":
@@ -0,0 +1,208 @@
+# multigrid.py - Coarse-to-Fine Value Iteration for Large Grids
+
+import numpy as np
+from environment import GridWorld
+from value_iteration import ValueIteration
+
+class MultigridSolver(ValueIteration):
+    """Value Iteration warm-started from a hierarchy of coarsened grids
+
+    Each coarse level merges 2x2 blocks of the level below into one cell,
+    so a coarse step stands for two fine steps (discount γ², reward of two
+    steps). The coarsest grid is solved first, its values are prolonged as
+    the starting point of the next finer level, and so on down to the real
+    grid, where sweeps run until the values are within θ of the fixed point.
+
+    Prolonged values alone cannot beat the grid diameter: with synchronous
+    sweeps any error is corrected one cell per sweep outward from the goal,
+    and values that are too high only decay by γ per sweep. Each level
+    therefore replaces the prolonged values by the exact value of their
+    greedy policy (a lower bound on V*) and relaxes with alternating line
+    Gauss-Seidel sweeps (rows down, rows up, columns right, columns left).
+    Raising a lower bound is pure propagation, which those sweeps carry
+    across the whole grid in one pass along the sweep direction.
+    """
+
+    def __init__(self, env, min_size=8):
+        super().__init__(env)
+        self.min_size = min_size
+        self.sweeps = []  # Sweeps per level, finest first
+        self.passes = []  # Policy evaluation passes per level, finest first
+
+    def coarsen(self, env):
+        """Build the GridWorld whose cells are 2x2 blocks of env"""
+        config = env.config
+        rows, cols = (env.rows + 1) // 2, (env.cols + 1) // 2
+
+        # A block is passable only if all of its cells are, so thin walls
+        # survive coarsening and coarse values err on the low side
+        valid = np.ones((rows * 2, cols * 2), dtype=bool)
+        valid[:env.rows, :env.cols] = env.get_valid_mask()
+        valid = valid.reshape(rows, 2, cols, 2).all(axis=(1, 3))
+
+        goal = (env.goal[0] // 2, env.goal[1] // 2)
+        fire = (env.fire[0] // 2, env.fire[1] // 2) if env.fire else None
+        if fire == goal:
+            fire = None
+        special = {goal, fire}
+        obstacles = [tuple(map(int, s)) for s in np.argwhere(~valid) if tuple(s) not in special]
+
+        return GridWorld(config.with_changes(
+            rows=rows,
+            cols=cols,
+            goal=goal,
+            fire=fire,
+            obstacles=obstacles,
+            start=None,
+            step_reward=config.step_reward * (1 + config.gamma),
+            gamma=config.gamma ** 2,
+        ))
+
+    def build_levels(self):
+        """Grids from finest (this environment) to coarsest"""
+        levels = [self.env]
+        while max(levels[-1].rows, levels[-1].cols) > self.min_size:
+            levels.append(self.coarsen(levels[-1]))
+        return levels
+
+    def sweep(self, vi, values, max_sweeps, tolerance):
+        """Alternating line Gauss-Seidel sweeps on vi's grid until max_change < tolerance
+
+        A sweep updates one row (or column) at a time from values that already
+        include the lines before it, so along the sweep direction a value
+        crosses the grid in a single sweep. Cells within a line still update
+        together; the next sweep direction covers that axis.
+        """
+        env = vi.env
+        targets = env.get_action_targets()
+        movable = env.get_movable_mask()
+        values = values.copy()
+
+        rows = [((i, slice(None)), [(allowed[i], n_row[i], n_col[i])
+                                    for allowed, n_row, n_col in targets])
+                for i in range(env.rows)]
+        cols = [((slice(None), j), [(allowed[:, j], n_row[:, j], n_col[:, j])
+                                    for allowed, n_row, n_col in targets])
+                for j in range(env.cols)]
+        orderings = [rows, rows[::-1], cols, cols[::-1]]
+
+        sweeps = 0
+        max_change = 0.0
+        while sweeps < max_sweeps:
+            lines = orderings[sweeps % len(orderings)]
+            sweeps += 1
+            max_change = 0.0
+            for line, line_targets in lines:
+                q_values = vi.calculate_q_arrays(values, line_targets).max(axis=0)
+                new_values = np.where(movable[line], q_values, values[line])
+                max_change = max(max_change, float(np.abs(new_values - values[line]).max()))
+                values[line] = new_values
+            if max_change < tolerance:
+                break
+
+        return values, sweeps, max_change
+
+    def evaluate_policy(self, vi, values):
+        """Exact value of the greedy policy for values on vi's grid
+
+        Follows each cell's policy moves by pointer doubling, so a path of L
+        moves takes about log2(L) passes. Returns (values, passes). Needs
+        γ < 1: a policy that loops forever has no finite value otherwise.
+        """
+        env = vi.env
+        next_cell, reward, has_action = vi.compile_policy(vi.policy_codes_from_array(values))
+
+        # Discount is 0 once the episode has ended (no action, or a terminal entered)
+        terminal = env.get_terminal_mask().ravel()
+        discount = np.where(has_action & ~terminal[next_cell], vi.config.gamma, 0.0)
+
+        # After each pass a cell's entries cover twice as many moves; discounts
+        # on loops shrink towards 0 and eventually underflow
+        passes = 0
+        while discount.any():
+            passes += 1
+            reward = reward + discount * reward[next_cell]
+            discount = discount * discount[next_cell]
+            next_cell = next_cell[next_cell]
+
+        return reward.reshape(env.rows, env.cols), passes
+
+    def prolong(self, coarse_values, coarse_env, env):
+        """Copy each coarse cell's value to the cells of its block
+
+        Blocks the coarse grid never updates (terminals, walls, dead ends)
+        take the lowest value of the blocks it does update, so the warm start
+        errs on the low side there too.
+        """
+        known = coarse_env.get_movable_mask()
+        floor = coarse_values[known].min() if known.any() else 0.0
+        coarse_values = np.where(known, coarse_values, floor)
+
+        values = coarse_values.repeat(2, axis=0).repeat(2, axis=1)[:env.rows, :env.cols]
+        values = np.where(env.get_movable_mask(), values, 0.0)
+        return values
+
+    def final_tolerance(self):
+        """max_change at which the fine-grid values are within θ of the fixed point
+
+        A warm start can sit close to a fixed point of max_change < θ while still
+        being off by up to θ/(1-γ), so the finest level uses the contraction bound
+        (every sweep direction is a γ-contraction with the same fixed point).
+        """
+        gamma = self.config.gamma
+        if gamma >= 1:
+            return self.config.theta
+        return self.config.theta * (1 - gamma) / max(gamma, 1e-12)
+
+    def run(self, max_iterations=None):
+        """Solve coarsest level first, then refine down to this grid"""
+        if max_iterations is None:
+            max_iterations = self.config.max_iterations
+
+        # Without discounting, too-high warm start values (e.g. in pockets cut
+        # off from the goal) never decay, and greedy policies have no value
+        if self.config.gamma >= 1:
+            print("\n⚠️  Multigrid needs γ < 1, using value iteration")
+            return ValueIteration.run(self, max_iterations)
+
+        print("\n--- Multigrid Value Iteration Started ---\n")
+
+        levels = self.build_levels()
+        values = np.zeros((levels[-1].rows, levels[-1].cols), dtype=np.float64)
+        self.sweeps = []
+        self.passes = []
+
+        for depth in range(len(levels) - 1, -1, -1):
+            env = levels[depth]
+            if depth < len(levels) - 1:
+                values = self.prolong(values, levels[depth + 1], env)
+
+            if depth == 0:
+                vi, max_sweeps, tolerance = self, max_iterations, self.final_tolerance()
+            else:
+                # Coarse levels only need to carry values across their own grid
+                vi = ValueIteration(env)
+                max_sweeps = min(max_iterations, 2 * (env.rows + env.cols))
+                tolerance = self.config.theta
+            values, passes = self.evaluate_policy(vi, values)
+            values, sweeps, max_change = self.sweep(vi, values, max_sweeps, tolerance)
+            self.sweeps.insert(0, sweeps)
+            self.passes.insert(0, passes)
+            print(f"Level {depth} ({env.rows}x{env.cols}): {passes} policy evaluation passes, "
+                  f"{sweeps} sweeps, max_change = {max_change:.6f}")
+
+        if max_change < tolerance:
+            print(f"\n✅ Converged after {self.sweeps[0]} sweeps on the full grid!")
+            print(f"   (Convergence threshold θ = {self.config.theta})")
+        else:
+            print(f"\n⚠️  Reached maximum iterations ({max_iterations}) without full convergence")
+            print(f"   Final max_change = {max_change:.6f}, threshold θ = {self.config.theta}")
+
+        self.set_value_array(values)
+        self.extract_policy_from_array(values)
+        self.history.append(self.V.copy())
+
+        print(f"\n📊 Total sweeps over all levels: {sum(self.sweeps)} "
+              f"(plus {sum(self.passes)} policy evaluation passes)")
+
+        return self.sweeps[0]
@@ -0,0 +1,122 @@
+# results_io.py - Binary Export / Memory-Mapped Loading of Solver Results
+
+# File layout (all integers little-endian):
+#   MAGIC (8 bytes) | header length (uint64) | JSON header | arrays...
+# Every array starts on an ALIGNMENT boundary and is stored C-contiguous,
+# so load_results can memory-map it without copying.
+
+import json
+import os
+import struct
+import numpy as np
+from config_dynamic import Config
+
+MAGIC = b'VIRES01\n'
+ALIGNMENT = 64
+
+def _aligned(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+def write_container(path, header, arrays):
+    """Write a JSON header and named arrays to path (atomically replacing it)"""
+    header = dict(header, arrays={})
+
+    # Offsets depend on the header size, which depends on the offsets;
+    # iterate until the layout is stable (normally twice)
+    data_start = 0
+    while True:
+        offset = data_start
+        for name, array in arrays.items():
+            offset = _aligned(offset)
+            header['arrays'][name] = {
+                'dtype': array.dtype.str,
+                'shape': list(array.shape),
+                'offset': offset,
+            }
+            offset += array.nbytes
+        header_bytes = json.dumps(header).encode('utf-8')
+        needed = _aligned(len(MAGIC) + 8 + len(header_bytes))
+        if needed == data_start:
+            break
+        data_start = needed
+
+    # Write next to the target and swap in, so readers never see a partial file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(header_bytes)))
+        f.write(header_bytes)
+        for name, array in arrays.items():
+            f.write(b'\0' * (header['arrays'][name]['offset'] - f.tell()))
+            f.write(np.ascontiguousarray(array).tobytes())
+    os.replace(tmp_path, path)
+
+def read_header(path):
+    """Read only the JSON header of a results file"""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a value iteration results file")
+        (length,) = struct.unpack('<Q', f.read(8))
+        return json.loads(f.read(length).decode('utf-8'))
+
+def read_container(path, mmap=True):
+    """Read (header, arrays) from path; arrays are read-only memory maps unless mmap=False"""
+    header = read_header(path)
+
+    arrays = {}
+    for name, info in header['arrays'].items():
+        dtype = np.dtype(info['dtype'])
+        shape = tuple(info['shape'])
+        if mmap and np.prod(shape) > 0:
+            arrays[name] = np.memmap(path, dtype=dtype, mode='r', offset=info['offset'], shape=shape)
+        else:
+            with open(path, 'rb') as f:
+                f.seek(info['offset'])
+                count = int(np.prod(shape))
+                arrays[name] = np.fromfile(f, dtype=dtype, count=count).reshape(shape)
+    return header, arrays
+
+def config_to_header(config):
+    """Config as JSON data; obstacles are stored as an array since they can be huge"""
+    config_data = config.to_dict()
+    del config_data['obstacles']
+    return config_data, np.asarray(config.obstacles, dtype=np.int32).reshape(-1, 2)
+
+def config_from_header(config_data, obstacles):
+    """Inverse of config_to_header"""
+    config_data = dict(config_data)
+    config_data['obstacles'] = [tuple(map(int, o)) for o in obstacles]
+    return Config.from_dict(config_data)
+
+def save_results(path, value_iteration, stats=None, include_history=False):
+    """Save V, the int-coded policy, config, stats and optional history to one file"""
+    vi = value_iteration
+    config_data, obstacles = config_to_header(vi.config)
+
+    arrays = {
+        'V': vi.get_value_array(),
+        'policy': vi.get_policy_codes(),
+        'obstacles': obstacles,
+    }
+    if include_history:
+        arrays['history'] = np.asarray([vi.get_value_array(i) for i in range(vi.get_history_length())],
+                                       dtype=np.float64)
+
+    all_stats = {'solver': type(vi).__name__, 'history_length': vi.get_history_length()}
+    all_stats.update(stats or {})
+
+    write_container(path, {'config': config_data, 'stats': all_stats}, arrays)
+
+    print(f"\n💾 Results saved to {path}")
+
+def load_results(path, mmap=True):
+    """Load a results file; arrays are read-only memory maps unless mmap=False
+
+    Returns a dict with 'V', 'policy', 'obstacles', optional 'history' arrays,
+    plus 'config' (a Config) and 'stats'. Policy codes index config.actions,
+    with -1 for states without an action.
+    """
+    header, results = read_container(path, mmap)
+    results['config'] = config_from_header(header['config'], results['obstacles'])
+    results['stats'] = header['stats']
+    return results
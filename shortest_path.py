@@ -0,0 +1,210 @@
+# shortest_path.py - Wavefront Fast Path for Deterministic Step-Cost Grids
+
+import numpy as np
+from value_iteration import ValueIteration
+
+class ShortestPathSolver(ValueIteration):
+    """Exact V and policy from a single BFS wavefront out of the goal
+
+    Transitions are deterministic and every non-terminal step earns the same
+    reward, so whenever reaching the goal sooner is never worse than
+    wandering forever (and fire is never better), V(s) only depends on the
+    shortest-path distance from s to the goal. Falls back to plain value
+    iteration when that does not hold.
+
+    Results are kept as (rows, cols) arrays; the V, policy and history dicts
+    of ValueIteration are only built if something reads them, so a large map
+    never pays for per-state Python objects.
+    """
+
+    def __init__(self, env):
+        self.env = env
+        self.config = env.config
+        self.iteration = 0
+        self.max_change = float('inf')
+        self.values = np.zeros((env.rows, env.cols), dtype=np.float64)
+        self.codes = np.full((env.rows, env.cols), -1, dtype=np.int8)
+        self.value_history = [self.values]  # Value arrays, as in history (None: kept as dicts)
+        self._V = None
+        self._policy = None
+        self._history = None
+
+    @property
+    def V(self):
+        """Value function dict, built from the value array on first use"""
+        if self._V is None:
+            self._V = {state: float(self.values[state]) for state in self.env.get_all_states()}
+        return self._V
+
+    @V.setter
+    def V(self, V):
+        self._V = V
+
+    @property
+    def policy(self):
+        """Policy dict, built from the policy codes on first use"""
+        if self._policy is None:
+            actions = self.env.actions
+            self._policy = {state: actions[self.codes[state]] if self.codes[state] >= 0 else None
+                            for state in self.env.get_all_states()}
+        return self._policy
+
+    @policy.setter
+    def policy(self, policy):
+        self._policy = policy
+
+    @property
+    def history(self):
+        """History dicts, built from the value arrays on first use"""
+        if self._history is None:
+            states = self.env.get_all_states()
+            self._history = [{state: float(H[state]) for state in states}
+                             for H in self.value_history]
+        return self._history
+
+    @history.setter
+    def history(self, history):
+        self._history = history
+
+    def get_value_array(self, iteration=None):
+        """Get value function as a (rows, cols) float array for specific iteration"""
+        if self.value_history is None:
+            return ValueIteration.get_value_array(self, iteration)
+        if iteration is not None and iteration < len(self.value_history):
+            return self.value_history[iteration].copy()
+        return self.values.copy()
+
+    def get_history_length(self):
+        """Number of stored history entries"""
+        if self.value_history is None:
+            return len(self._history)
+        return len(self.value_history)
+
+    def set_value_array(self, values):
+        """Set value function from a (rows, cols) float array"""
+        self.values = np.asarray(values, dtype=np.float64)
+        self._V = None
+
+    def get_policy_codes(self):
+        """Get policy as a (rows, cols) int array of indices into config.actions (-1 = no action)"""
+        return self.codes.copy()
+
+    def is_applicable(self):
+        """Check that shortest paths give the optimal values"""
+        gamma = self.config.gamma
+        if not 0 <= gamma < 1:
+            return False
+
+        # Every move must cost the same (e.g. no weighted diagonals)
+        if len(set(self.env.action_rewards.tolist())) > 1:
+            return False
+
+        # Every move must be reversible, so states can bounce instead of terminating
+        offsets = set(self.env.get_action_offsets())
+        if any((-d_row, -d_col) not in offsets for d_row, d_col in offsets):
+            return False
+
+        # Value of never reaching a terminal state
+        wander = self.config.step_reward / (1 - gamma)
+        if self.config.goal_reward < wander:
+            return False
+        if self.env.fire and self.config.fire_reward > wander:
+            return False
+        return True
+
+    def run(self, max_iterations=None):
+        """Solve with one wavefront pass, or value iteration if not applicable"""
+        if not self.is_applicable():
+            print("\n⚠️  Shortest-path fast path not applicable, using value iteration")
+            return self.run_value_iteration(max_iterations)
+
+        print("\n--- Shortest-Path Wavefront Started ---\n")
+
+        distance = self.compute_distances()
+        values = self.distances_to_values(distance)
+
+        self.set_value_array(values)
+        self.codes = self.policy_codes_from_array(values)
+        self._policy = None
+        self.value_history.append(values)
+        self._history = None
+        self.iteration = 1
+        self.max_change = 0.0
+
+        reachable = int((distance > 0).sum())
+        print(f"✅ Solved in one wavefront pass ({int(distance.max())} levels, "
+              f"{reachable} states reach the goal)")
+
+        return 1
+
+    def run_value_iteration(self, max_iterations=None):
+        """Solve with plain ValueIteration and adopt its results"""
+        vi = ValueIteration(self.env)
+        iterations = vi.run(max_iterations)
+
+        self.values = vi.get_value_array()
+        self.codes = vi.get_policy_codes()
+        # Keep the history in the dict form it was built in, not a second copy
+        self.value_history = None
+        self._V, self._policy, self._history = vi.V, vi.policy, vi.history
+        self.iteration, self.max_change = vi.iteration, vi.max_change
+        return iterations
+
+    def compute_distances(self):
+        """BFS from the goal over predecessors; -1 marks states that cannot reach it"""
+        rows, cols = self.env.rows, self.env.cols
+        passable = self.env.get_valid_mask()
+        if self.env.fire:
+            passable[self.env.fire] = False
+        passable = passable.ravel()
+
+        distance = np.full(rows * cols, -1, dtype=np.int64)
+        goal = self.env.goal[0] * cols + self.env.goal[1]
+        distance[goal] = 0
+
+        frontier = np.array([goal], dtype=np.int64)
+        level = 0
+        while frontier.size:
+            level += 1
+            f_row, f_col = np.divmod(frontier, cols)
+            predecessors = []
+
+            # p is a predecessor of f when taking some action from p lands on f
+            for d_row, d_col in self.env.get_action_offsets():
+                p_row, p_col = f_row - d_row, f_col - d_col
+                inside = (p_row >= 0) & (p_row < rows) & (p_col >= 0) & (p_col < cols)
+                predecessors.append(p_row[inside] * cols + p_col[inside])
+
+            candidates = np.unique(np.concatenate(predecessors))
+            candidates = candidates[passable[candidates] & (distance[candidates] < 0)]
+            distance[candidates] = level
+            frontier = candidates
+
+        return distance.reshape(rows, cols)
+
+    def distances_to_values(self, distance):
+        """Closed-form discounted return for reaching the goal in d steps"""
+        gamma = self.config.gamma
+        step = self.config.step_reward
+        wander = step / (1 - gamma)
+
+        # d steps = (d - 1) step rewards followed by the goal reward
+        discount = gamma ** np.maximum(distance - 1, 0).astype(np.float64)
+        values = wander * (1 - discount) + discount * self.config.goal_reward
+        # Without a path to the goal the best is to bounce between non-terminal
+        # states forever, or to walk into the fire if that is the only move.
+        # States with no valid move are never updated by value iteration.
+        terminal = self.env.get_terminal_mask()
+        movable = np.zeros(distance.shape, dtype=bool)
+        wanders = np.zeros(distance.shape, dtype=bool)
+        for allowed, n_row, n_col in self.env.get_action_targets():
+            movable |= allowed
+            wanders |= allowed & ~terminal[n_row, n_col]
+        stuck = np.where(movable, self.config.fire_reward, 0.0)
+        values = np.where(distance > 0, values, np.where(wanders, wander, stuck))
+
+        # Terminal states keep their initial value, as in value iteration
+        values[self.env.goal] = 0.0
+        if self.env.fire:
+            values[self.env.fire] = 0.0
+        return values
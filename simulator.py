@@ -0,0 +1,146 @@
+# simulator.py - Batched Policy Rollouts
+
+import numpy as np
+
+# Outcome codes for each trajectory
+RUNNING = 0
+GOAL = 1
+FIRE = 2
+
+class Simulator:
+    """Execute a computed policy from many start states at once
+
+    The policy is deterministic, so a trajectory only depends on its start
+    cell. Each cell's end cell, length and return are computed once per
+    max_steps by pointer doubling (about log2(max_steps) passes over the
+    grid); a batch of rollouts is then a table lookup, however long or
+    endless the individual trajectories are.
+    """
+
+    def __init__(self, value_iteration):
+        self.vi = value_iteration
+        self.env = value_iteration.env
+        self.config = self.env.config
+        self.compile()
+
+    def compile(self):
+        """Compile the policy into flat next-cell, move reward and outcome tables"""
+        # Cells without an action (terminals, obstacles, dead ends) stay put
+        self.next_cell, self.reward, self.has_action = self.vi.compile_policy(self.vi.get_policy_codes())
+
+        self.outcome = np.full(self.env.rows * self.env.cols, RUNNING, dtype=np.int8)
+        self.outcome[self.to_index(self.env.goal)] = GOAL
+        if self.env.fire:
+            self.outcome[self.to_index(self.env.fire)] = FIRE
+
+        # A trajectory ends on a terminal or on a cell without an action
+        self.moving = self.has_action & (self.outcome == RUNNING)
+        self.step_cell = np.where(self.moving, self.next_cell, np.arange(self.next_cell.size))
+        self._tables = {}  # max_steps -> (end cell, length, return)
+
+    def get_tables(self, max_steps):
+        """Per-cell (end cell, length, return) after at most max_steps moves"""
+        if max_steps in self._tables:
+            return self._tables[max_steps]
+
+        n = self.step_cell.size
+        # Tables for a block of 2^k moves, starting with k = 0
+        jump = self.step_cell
+        length = self.moving.astype(np.int64)
+        returns = np.where(self.moving, self.reward, 0.0)
+        discount = np.where(self.moving, self.config.gamma, 1.0)
+
+        end = np.arange(n)
+        total_length = np.zeros(n, dtype=np.int64)
+        total_return = np.zeros(n, dtype=np.float64)
+        total_discount = np.ones(n, dtype=np.float64)
+
+        # Add the blocks that make up max_steps, doubling the block each pass
+        steps = max_steps
+        while steps:
+            if steps & 1:
+                total_return += total_discount * returns[end]
+                total_discount *= discount[end]
+                total_length += length[end]
+                end = jump[end]
+            steps >>= 1
+            if steps:
+                returns = returns + discount * returns[jump]
+                discount = discount * discount[jump]
+                length = length + length[jump]
+                jump = jump[jump]
+
+        self._tables[max_steps] = (end, total_length, total_return)
+        return self._tables[max_steps]
+
+    def to_index(self, state):
+        """Convert (row, col) to a flat cell index"""
+        return state[0] * self.env.cols + state[1]
+
+    def sample_start_states(self, n, seed=None):
+        """Sample n non-terminal valid start states as an (n, 2) array
+
+        Returns an empty (0, 2) array when every valid state is terminal.
+        """
+        states = np.argwhere(self.env.get_valid_mask() & ~self.env.get_terminal_mask())
+        if not len(states):
+            return np.empty((0, 2), dtype=np.int64)
+        rng = np.random.default_rng(seed)
+        return states.astype(np.int64)[rng.integers(len(states), size=n)]
+
+    def rollout(self, start_states, max_steps=None, record_paths=False):
+        """Run one trajectory per start state
+
+        start_states is a (row, col) pair or an (n, 2) array of them. Returns a
+        dict of per-trajectory arrays: 'length', 'return', 'outcome' and, with
+        record_paths, 'paths' of shape (n, max_steps + 1) holding flat indices.
+        A trajectory stops on a terminal or on a cell without an action;
+        RUNNING outcomes never reached a terminal.
+        """
+        if max_steps is None:
+            max_steps = self.env.rows * self.env.cols
+
+        starts = np.atleast_2d(np.asarray(start_states, dtype=np.int64))
+        cells = starts[:, 0] * self.env.cols + starts[:, 1]
+        end, length, returns = self.get_tables(max_steps)
+
+        results = {
+            'length': length[cells],
+            'return': returns[cells],
+            'outcome': self.outcome[end[cells]],
+        }
+
+        if record_paths:
+            paths = np.empty((len(cells), max_steps + 1), dtype=np.int64)
+            paths[:, 0] = cells
+            steps = int(results['length'].max()) if len(cells) else 0
+            for step in range(steps):
+                cells = self.step_cell[cells]
+                paths[:, step + 1] = cells
+            paths[:, steps + 1:] = cells[:, None]
+            results['paths'] = paths
+
+        return results
+
+    def summarize(self, results):
+        """Aggregate rollout results into summary statistics"""
+        outcomes = results['outcome']
+        return {
+            'episodes': len(outcomes),
+            'mean_length': float(results['length'].mean()),
+            'mean_return': float(results['return'].mean()),
+            'success_rate': float(np.mean(outcomes == GOAL)),
+            'fire_rate': float(np.mean(outcomes == FIRE)),
+            'timeout_rate': float(np.mean(outcomes == RUNNING)),
+        }
+
+    def print_summary(self, results):
+        """Print rollout summary statistics"""
+        summary = self.summarize(results)
+        print("\nPolicy Rollouts:")
+        print(f"   Episodes:      {summary['episodes']}")
+        print(f"   Mean length:   {summary['mean_length']:.2f}")
+        print(f"   Mean return:   {summary['mean_return']:.4f}")
+        print(f"   Success rate:  {summary['success_rate']:.1%}")
+        print(f"   Fire rate:     {summary['fire_rate']:.1%}")
+        print(f"   Timeout rate:  {summary['timeout_rate']:.1%}")
@@ -1,16 +1,32 @@
 # value_iteration.py - Value Iteration Algorithm
 
-import config_dynamic as config
+import numpy as np
 from environment import GridWorld
+from checkpoint import CheckpointWriter, load_checkpoint
+
+ACTION_ARROWS = {
+    'UP': '↑',
+    'DOWN': '↓',
+    'LEFT': '←',
+    'RIGHT': '→',
+    'UP_LEFT': '↖',
+    'UP_RIGHT': '↗',
+    'DOWN_LEFT': '↙',
+    'DOWN_RIGHT': '↘',
+    'STAY': '○',
+}
 
 class ValueIteration:
     """Value Iteration Algorithm for Grid World"""
     
     def __init__(self, env):
         self.env = env
+        self.config = env.config  # Single source of parameters, shared with env
         self.V = {}  # Value function
         self.policy = {}  # Optimal policy
         self.history = []  # Store V for each iteration
+        self.iteration = 0  # Iterations completed so far
+        self.max_change = float('inf')  # max_change of the last iteration
         
         # Initialize value function to 0
         for state in self.env.get_all_states():
@@ -22,76 +38,103 @@ class ValueIteration:
     def calculate_q_value(self, state, action):
         """Calculate Q(s,a) = R(s,a) + γ * V(s')"""
         next_state = self.env.get_next_state(state, action)
-        
-        # Immediate reward is from the next state (or 0 for normal transitions)
+        return self.calculate_move_value(next_state, self.config.get_step_reward(action))
+    
+    def calculate_move_value(self, next_state, step_reward):
+        """Q-value of a move landing on next_state with the given step reward"""
+        # Immediate reward is from the next state (or the step reward for normal transitions)
         if next_state == self.env.goal:
-            reward = self.env.get_reward(next_state)
             # Terminal state, no future value
-            q_value = reward
-        elif self.env.fire and next_state == self.env.fire:
-            reward = self.env.get_reward(next_state)
+            return self.env.get_reward(next_state)
+        if self.env.fire and next_state == self.env.fire:
             # Terminal state, no future value
-            q_value = reward
-        else:
-            reward = self.env.get_reward(state)
-            q_value = reward + config.GAMMA * self.V[next_state]
-        
-        return q_value
+            return self.env.get_reward(next_state)
+        return step_reward + self.config.gamma * self.V[next_state]
     
-    def run(self, max_iterations=None):
-        """Run Value Iteration until convergence"""
+    def run(self, max_iterations=None, checkpoint_path=None, checkpoint_every=10):
+        """Run Value Iteration until convergence
+        
+        With checkpoint_path, V and the iteration count are written there every
+        checkpoint_every iterations (in the background) and at the end, and new
+        history entries are appended to a side file; ValueIteration.resume
+        continues from that checkpoint.
+        """
         if max_iterations is None:
-            max_iterations = config.MAX_ITERATIONS
+            max_iterations = self.config.max_iterations
         
-        iteration = 0
+        iteration = self.iteration
+        max_change = self.max_change
+        converged = max_change < self.config.theta
+        writer = None
+        if checkpoint_path:
+            # A resumed run's history up to here is already in the side file
+            saved = self.get_history_length() if iteration else 0
+            writer = CheckpointWriter(checkpoint_path, history_length=saved)
         
-        print("\n--- Value Iteration Started ---\n")
+        if iteration == 0:
+            print("\n--- Value Iteration Started ---\n")
+        else:
+            print(f"\n--- Value Iteration Resumed after iteration {iteration} ---\n")
         
-        while iteration < max_iterations:
-            iteration += 1
-            V_new = self.V.copy()
-            max_change = 0
-            
-            # Update value for each state
-            for state in self.env.get_all_states():
-                # Terminal states have fixed values
-                if self.env.is_terminal(state):
-                    continue
+        try:
+            while not converged and iteration < max_iterations:
+                iteration += 1
+                V_new = self.V.copy()
+                max_change = 0
                 
-                # Get possible actions
-                actions = self.env.get_possible_actions(state)
-                if not actions:
-                    continue
+                # Update value for each state
+                for state in self.env.get_all_states():
+                    # Terminal states have fixed values
+                    if self.env.is_terminal(state):
+                        continue
+                    
+                    # Get precomputed moves
+                    moves = self.env.get_moves(state)
+                    if not moves:
+                        continue
+                    
+                    # Calculate Q-value for each action
+                    q_values = []
+                    for _, next_state, step_reward in moves:
+                        q = self.calculate_move_value(next_state, step_reward)
+                        q_values.append(q)
+                    
+                    # Take maximum
+                    V_new[state] = max(q_values)
+                    
+                    # Track maximum change
+                    change = abs(V_new[state] - self.V[state])
+                    max_change = max(max_change, change)
                 
-                # Calculate Q-value for each action
-                q_values = []
-                for action in actions:
-                    q = self.calculate_q_value(state, action)
-                    q_values.append(q)
+                # Store history for visualization
+                self.history.append(self.V.copy())
                 
-                # Take maximum
-                V_new[state] = max(q_values)
+                # Update value function
+                self.V = V_new
+                self.iteration = iteration
+                self.max_change = max_change
                 
-                # Track maximum change
-                change = abs(V_new[state] - self.V[state])
-                max_change = max(max_change, change)
-            
-            # Store history for visualization
-            self.history.append(self.V.copy())
-            
-            # Update value function
-            self.V = V_new
-            
-            print(f"Iteration {iteration}: max_change = {max_change:.6f}")
+                if writer is not None and iteration % checkpoint_every == 0:
+                    writer.save(self)
+                
+                print(f"Iteration {iteration}: max_change = {max_change:.6f}")
+                
+                # Check convergence
+                converged = max_change < self.config.theta
             
-            # Check convergence
-            if max_change < config.THETA:
-                print(f"\n✅ Converged after {iteration} iterations!")
-                print(f"   (Convergence threshold θ = {config.THETA})")
-                break
+            if writer is not None:
+                writer.save(self)
+        finally:
+            # Flush the newest snapshot even if a sweep raised or was interrupted
+            if writer is not None:
+                writer.close()
+        
+        if converged:
+            print(f"\n✅ Converged after {iteration} iterations!")
+            print(f"   (Convergence threshold θ = {self.config.theta})")
         else:
             print(f"\n⚠️  Reached maximum iterations ({max_iterations}) without full convergence")
-            print(f"   Final max_change = {max_change:.6f}, threshold θ = {config.THETA}")
+            print(f"   Final max_change = {max_change:.6f}, threshold θ = {self.config.theta}")
         
         # Extract optimal policy
         self.extract_policy()
@@ -100,6 +143,40 @@ class ValueIteration:
         
         return iteration
     
+    def restore(self, checkpoint):
+        """Restore V, history and iteration count from load_checkpoint() output"""
+        states = self.env.get_all_states()
+        V = checkpoint['V']
+        self.V = {state: float(V[state]) for state in states}
+        
+        if checkpoint['history'] is not None:
+            self.history = [{state: float(H[state]) for state in states}
+                            for H in checkpoint['history']]
+        
+        self.iteration = checkpoint['iteration']
+        self.max_change = checkpoint['max_change']
+    
+    @staticmethod
+    def resume(path, env=None, max_iterations=None, checkpoint_every=10):
+        """Continue a checkpointed ValueIteration.run to completion, checkpointing to the same file
+        
+        Only plain ValueIteration writes checkpoints, so this always returns a
+        ValueIteration, whichever class it is called on.
+        """
+        checkpoint = load_checkpoint(path)
+        if checkpoint['solver'] != ValueIteration.__name__:
+            raise ValueError(f"{path} was written by {checkpoint['solver']}, "
+                             f"only {ValueIteration.__name__} runs can be resumed")
+        if env is None:
+            env = GridWorld(checkpoint['config'])
+        elif env.config != checkpoint['config']:
+            raise ValueError(f"env.config does not match the configuration stored in {path}")
+        
+        vi = ValueIteration(env)
+        vi.restore(checkpoint)
+        vi.run(max_iterations, checkpoint_path=path, checkpoint_every=checkpoint_every)
+        return vi
+    
     def extract_policy(self):
         """Extract optimal policy from value function"""
         for state in self.env.get_all_states():
@@ -107,8 +184,8 @@ class ValueIteration:
                 self.policy[state] = None
                 continue
             
-            actions = self.env.get_possible_actions(state)
-            if not actions:
+            moves = self.env.get_moves(state)
+            if not moves:
                 self.policy[state] = None
                 continue
             
@@ -116,8 +193,8 @@ class ValueIteration:
             best_action = None
             best_value = float('-inf')
             
-            for action in actions:
-                q = self.calculate_q_value(state, action)
+            for action, next_state, step_reward in moves:
+                q = self.calculate_move_value(next_state, step_reward)
                 if q > best_value:
                     best_value = q
                     best_action = action
@@ -135,7 +212,7 @@ class ValueIteration:
         
         for state in self.env.get_all_states():
             row, col = state
-            grid[row][col] = V[state]
+            grid[row][col] = V.get(state, 0.0)
         
         return grid
     
@@ -147,14 +224,8 @@ class ValueIteration:
             row, col = state
             action = self.policy.get(state)
             
-            if action == 'UP':
-                grid[row][col] = '↑'
-            elif action == 'DOWN':
-                grid[row][col] = '↓'
-            elif action == 'LEFT':
-                grid[row][col] = '←'
-            elif action == 'RIGHT':
-                grid[row][col] = '→'
+            if action is not None:
+                grid[row][col] = ACTION_ARROWS[action]
             elif state == self.env.goal:
                 grid[row][col] = 'G'
             elif self.env.fire and state == self.env.fire:
@@ -168,3 +239,94 @@ class ValueIteration:
             grid[row][col] = 'X'
         
         return grid
+    
+    def get_value_array(self, iteration=None):
+        """Get value function as a (rows, cols) float array for specific iteration"""
+        if iteration is not None and iteration < len(self.history):
+            V = self.history[iteration]
+        else:
+            V = self.V
+        
+        values = np.zeros((self.env.rows, self.env.cols), dtype=np.float64)
+        for state, value in V.items():
+            values[state] = value
+        return values
+    
+    def get_history_length(self):
+        """Number of stored history entries"""
+        return len(self.history)
+    
+    def set_value_array(self, values):
+        """Set value function from a (rows, cols) float array"""
+        for state in self.V:
+            self.V[state] = float(values[state])
+    
+    def calculate_q_arrays(self, values, targets=None):
+        """Vectorised calculate_q_value: (n_actions, rows, cols) array, -inf where not allowed"""
+        if targets is None:
+            targets = self.env.get_action_targets()
+        goal = self.env.goal
+        fire = self.env.fire
+        
+        q_values = []
+        for (allowed, n_row, n_col), step_reward in zip(targets, self.env.action_rewards):
+            q = step_reward + self.config.gamma * values[n_row, n_col]
+            q = np.where((n_row == goal[0]) & (n_col == goal[1]), self.env.get_reward(goal), q)
+            if fire:
+                q = np.where((n_row == fire[0]) & (n_col == fire[1]), self.env.get_reward(fire), q)
+            q_values.append(np.where(allowed, q, -np.inf))
+        
+        return np.stack(q_values)
+    
+    def policy_codes_from_array(self, values):
+        """Vectorised greedy policy as get_policy_codes would return it; ties go to the first action"""
+        q_values = self.calculate_q_arrays(values)
+        codes = q_values.argmax(axis=0).astype(np.int8)
+        has_action = np.isfinite(q_values.max(axis=0)) & ~self.env.get_terminal_mask()
+        codes[~has_action] = -1
+        return codes
+    
+    def compile_policy(self, codes):
+        """Flat (next_cell, reward, has_action) tables for a (rows, cols) array of policy codes
+        
+        Cells are row-major flat indices. Cells without an action stay put with
+        reward 0; a move into a terminal earns the terminal's reward instead, as
+        in calculate_q_value.
+        """
+        env = self.env
+        codes = np.asarray(codes).ravel()
+        has_action = codes >= 0
+        next_cell = np.arange(codes.size, dtype=np.int64)
+        reward = np.zeros(codes.size, dtype=np.float64)
+        
+        cells = np.flatnonzero(has_action)
+        actions = codes[cells]
+        d_row, d_col = env.action_offsets[actions].T
+        next_cell[cells] = cells + d_row * env.cols + d_col
+        reward[cells] = env.action_rewards[actions]
+        
+        for state in (env.goal, env.fire):
+            if state:
+                entering = cells[next_cell[cells] == state[0] * env.cols + state[1]]
+                reward[entering] = env.get_reward(state)
+        
+        return next_cell, reward, has_action
+    
+    def extract_policy_from_array(self, values):
+        """Vectorised extract_policy; ties go to the first action, as in extract_policy"""
+        codes = self.policy_codes_from_array(values)
+        
+        for state in self.V:
+            code = codes[state]
+            self.policy[state] = self.env.actions[code] if code >= 0 else None
+    
+    def get_policy_codes(self):
+        """Get policy as a (rows, cols) int array of indices into config.actions (-1 = no action)"""
+        codes = np.full((self.env.rows, self.env.cols), -1, dtype=np.int8)
+        action_index = {action: i for i, action in enumerate(self.env.actions)}
+        
+        for state, action in self.policy.items():
+            if action is not None:
+                codes[state] = action_index[action]
+        
+        return codes
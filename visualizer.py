@@ -4,7 +4,6 @@ import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 from matplotlib.patches import Rectangle
 import numpy as np
-import config_dynamic as config
 
 class Visualizer:
     """Visualize Value Function and Policy"""
@@ -12,6 +11,9 @@ class Visualizer:
     def __init__(self, value_iteration):
         self.vi = value_iteration
         self.env = value_iteration.env
+        self.config = self.env.config
+        self.vmin = min(self.config.fire_reward, self.config.step_reward)
+        self.vmax = self.config.goal_reward
     
     def print_text_grid(self, iteration=None):
         """Print value function as text grid"""
@@ -46,7 +48,7 @@ class Visualizer:
         fig, ax = plt.subplots(figsize=(8, 8))
         
         # Plot heatmap
-        im = ax.imshow(grid, cmap='RdYlGn', aspect='auto', vmin=-1, vmax=1)
+        im = ax.imshow(grid, cmap='RdYlGn', aspect='auto', vmin=self.vmin, vmax=self.vmax)
         
         # Add colorbar
         plt.colorbar(im, ax=ax, label='Value')
@@ -91,7 +93,7 @@ class Visualizer:
         fig, ax = plt.subplots(figsize=(8, 8))
         
         # Plot heatmap
-        im = ax.imshow(grid, cmap='RdYlGn', aspect='auto', vmin=-1, vmax=1)
+        im = ax.imshow(grid, cmap='RdYlGn', aspect='auto', vmin=self.vmin, vmax=self.vmax)
         plt.colorbar(im, ax=ax, label='Value')
         
         # Add grid lines
@@ -134,7 +136,7 @@ class Visualizer:
             grid = self.vi.get_value_grid(frame)
             
             # Plot heatmap
-            im = ax.imshow(grid, cmap='RdYlGn', aspect='auto', vmin=-1, vmax=1)
+            im = ax.imshow(grid, cmap='RdYlGn', aspect='auto', vmin=self.vmin, vmax=self.vmax)
             
             # Add grid lines
             ax.set_xticks(np.arange(self.env.cols))